@@ -3,14 +3,171 @@
 # * This script uses the ArcGIS Maps SDK for Javascript. Please refer to the specific
 #   terms of use for the SDK: https://developers.arcgis.com/javascript/latest/licensing/
 
+from array import array
+from base64 import b64encode
 from json import dumps
-from string import Template
 import math
+import sys
 from IPython.display import display, HTML
 import uuid
 import geoanalytics.sql.functions as ST
 from geoanalytics.sql import PointUDT, MultiPointUDT, LinestringUDT, PolygonUDT, SpatialReference
 import pyspark.sql.functions as F
+from pyspark import StorageLevel
+
+# Serializes user provided objects (renderers, labels, popups) and the map extent. Non-finite floats raise rather than
+# producing JSON that the browser can't parse.
+def _dumps(obj):
+    return dumps(obj, allow_nan=False)
+
+try:
+    # orjson is used for the layer payloads built here (fields, spatial reference and coordinates) when it is
+    # available. These payloads are small apart from the base64 coordinate strings, so the gain is modest. They only
+    # hold strings, ints and None, so both paths produce equivalent (though not byte-identical) JSON.
+    import orjson
+
+    def _dumps_layer(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _dumps_layer = _dumps
+
+# HTML for displaying a map. Rendered with `str.format_map` so literal braces are doubled.
+_MAP_TEMPLATE = """
+        <meta name="viewport" content="initial-scale=1,maximum-scale=1,user-scalable=no" />
+        <link rel="stylesheet" href="https://js.arcgis.com/{sdk_version}/esri/themes/light/main.css" />
+        <style>
+          html,
+          body,
+          #{div_id} {{
+            padding: 0;
+            margin: 0;
+            height: {height};
+            width: {width};
+          }}
+        </style>
+        <script src="https://js.arcgis.com/{sdk_version}/"></script>
+        {layers_data}
+        <script>
+ 
+        require(["esri/Map", "esri/views/MapView", "esri/layers/FeatureLayer"], 
+                 (Map, MapView, FeatureLayer) => {{ 
+                 
+             if (window.html_map_resources === undefined) {{
+                 console.log("Creating map resources")
+                 
+                 const tracked = new Set()
+
+                 const timer = setInterval(() => {{
+                   //console.log("Checking for removed maps:", new Date().toLocaleTimeString());
+                   window.html_map_resources.maps.forEach((entry) => {{
+                      const {{ container, destroyMapView }} = entry;
+                      if (!document.body.contains(container)) {{
+                        console.log("Removing " + container)
+                        destroyMapView(); // Call the cleanup function
+                        window.html_map_resources.maps.delete(entry); // Remove the container from the list
+                        console.log("After destroy", window.html_map_resources)
+                      }}
+                    }});
+                 }}, 5000);
+                 
+                 window.html_map_resources = {{
+                   maps: tracked,
+                   timer: timer
+                 }}
+             }}
+             console.log("After create", window.html_map_resources)
+             const container = document.getElementById("{div_id}");
+             if (!container) {{
+               console.log("Container not found: exiting...");
+               return;
+             }}
+                 
+             const map = new Map({{
+               basemap: "{basemap}"
+             }});
+    
+             // Assigns object ids to the layer source and adds point geometries encoded as base64 Float64 x, y and
+             // (optional) z buffers
+             function decodeLayer(data) {{
+               const coordinates = data.coordinates;
+               delete data.coordinates;
+               const decode = (b64) => new Float64Array(Uint8Array.from(atob(b64), (c) => c.charCodeAt(0)).buffer);
+               const x = coordinates ? decode(coordinates.x) : null;
+               const y = coordinates ? decode(coordinates.y) : null;
+               const z = coordinates && coordinates.z ? decode(coordinates.z) : null;
+               if (z) {{
+                 data.hasZ = true;
+               }}
+               data.source.forEach((feature, i) => {{
+                 feature.attributes[data.objectIdField] = i + 1;
+                 if (coordinates) {{
+                   feature.geometry = z ? {{ type: "point", x: x[i], y: y[i], z: z[i] }} : {{ type: "point", x: x[i], y: y[i] }};
+                 }}
+               }});
+               return data;
+             }}
+
+             const layers = [];
+             {layers_js}
+    
+             const view = new MapView({{
+               map: map, 
+               container: "{div_id}",
+               extent: {extent_js},
+               constraints: {{
+                 snapToZoom: false,
+                 rotationEnabled: false
+               }},
+               navigation: {{
+                 actionMap : {{
+                   mouseWheel : "none"
+                 }}
+               }}
+             }});
+
+             function destroyMapView() {{
+               if (view) {{
+                 view.map.destroy()
+                 view.container = null; // Detach the view from the DOM
+                 view.destroy(); // Destroy the view and release resources
+                 console.log("MapView destroyed");
+               }}
+             }}
+             
+             window.html_map_resources.maps.add({{container, destroyMapView}})
+    
+        }});
+        
+        </script>
+        <div id="{div_id}"></div>
+        """
+
+# Javascript for adding a layer to the map. Rendered with `str.format_map` using the layer properties.
+_LAYER_TEMPLATE = """
+
+            const layer{i} = new FeatureLayer(decodeLayer(JSON.parse(document.getElementById("{data_id}").textContent)));
+
+            const renderer{i} = {renderer}
+            if (renderer{i} != null) {{
+              layer{i}.renderer = renderer{i}
+            }}
+
+            const labelingInfo{i} = {labelingInfo}
+            if (labelingInfo{i} != null) {{
+              layer{i}.labelingInfo = labelingInfo{i}
+            }}
+
+            const popupTemplate{i} = {popupTemplate}
+            if (popupTemplate{i} != null) {{
+              layer{i}.popupTemplate = popupTemplate{i}
+            }}
+
+            map.add(layer{i});
+            layers.push(layer{i});
+            """
+
+# HTML data block holding the FeatureLayer properties of a layer as JSON
+_LAYER_DATA_TEMPLATE = """<script type="application/json" id="{data_id}">{features}</script>"""
 
 class EsriJSMap:
     """
@@ -36,7 +193,7 @@ class EsriJSMap:
     
     """
 
-    # Maps Spark geometry type to the Javascript class (and type name with .lower())
+    # Maps Spark geometry type to the Javascript class (and geometry type name with .lower())
     _geometry_mapping = {
         PointUDT: "Point",
         PolygonUDT: "Polygon",
@@ -44,6 +201,15 @@ class EsriJSMap:
         MultiPointUDT: "Multipoint"
     }
 
+    # Schema of the Esri JSON geometry for each non-point geometry type name (points are sent as coordinate buffers).
+    # Parsing the Esri JSON with this schema drops any properties we don't need per feature. Notably, this drops the
+    # spatialReference so that it isn't repeated for every feature (it is set once on the FeatureLayer).
+    _esri_json_schema = {
+        "multipoint": "points array<array<double>>",
+        "polyline": "paths array<array<array<double>>>",
+        "polygon": "rings array<array<array<double>>>"
+    }
+
     # Maps the Spark data type string to Esri Maps SDK type string
     _type_mapping = {
         "string": "string",
@@ -106,9 +272,9 @@ class EsriJSMap:
         field_set = set()
         field_set.update(fields)
 
-        # We do not include all fields by default because the feature data is injected directly into the script source which can 
-        # affect browser performance. Map element objects that require fields can list them in the "_references" tag so that we
-        # know to include them for proper map rendering.
+        # We do not include all fields by default because the feature data is embedded in the page (as an application/json
+        # data block) and must be parsed by the browser, which can affect browser performance. Map element objects that
+        # require fields can list them in the "_references" tag so that we know to include them for proper map rendering.
         for item in [renderer, label, popup]:
             if item is not None:
                 field_set.update(item.pop("_references", []))
@@ -117,9 +283,9 @@ class EsriJSMap:
         
         self.layers.append({
             "features": features_json,
-            "renderer": "null" if renderer is None else dumps(renderer),
-            "labelingInfo": "null" if label is None else dumps(label),
-            "popupTemplate" : "null" if popup is None else dumps(popup),
+            "renderer": _dumps(renderer),
+            "labelingInfo": _dumps(label),
+            "popupTemplate" : _dumps(popup),
             "extent" : extent
         })
 
@@ -127,102 +293,15 @@ class EsriJSMap:
         """
         Generate and display the HTML for the map.
         """
-        (layers_js, extent_js) = self._generate_layers_js()
-        map_template = Template("""
-        <meta name="viewport" content="initial-scale=1,maximum-scale=1,user-scalable=no" />
-        <link rel="stylesheet" href="https://js.arcgis.com/$sdk_version/esri/themes/light/main.css" />
-        <style>
-          html,
-          body,
-          #$div_id {
-            padding: 0;
-            margin: 0;
-            height: $height;
-            width: $width;
-          }
-        </style>
-        <script src="https://js.arcgis.com/$sdk_version/"></script>
-        <script>
- 
-        require(["esri/Map", "esri/views/MapView", "esri/layers/FeatureLayer",
-                 "esri/geometry/Point", "esri/geometry/Multipoint", "esri/geometry/Polyline", "esri/geometry/Polygon"], 
-                 (Map, MapView, FeatureLayer, Point, Multipoint, Polyline, Polygon) => { 
-                 
-             if (window.html_map_resources === undefined) {
-                 console.log("Creating map resources")
-                 
-                 const tracked = new Set()
-
-                 const timer = setInterval(() => {
-                   //console.log("Checking for removed maps:", new Date().toLocaleTimeString());
-                   window.html_map_resources.maps.forEach((entry) => {
-                      const { container, destroyMapView } = entry;
-                      if (!document.body.contains(container)) {
-                        console.log("Removing " + container)
-                        destroyMapView(); // Call the cleanup function
-                        window.html_map_resources.maps.delete(entry); // Remove the container from the list
-                        console.log("After destroy", window.html_map_resources)
-                      }
-                    });
-                 }, 5000);
-                 
-                 window.html_map_resources = {
-                   maps: tracked,
-                   timer: timer
-                 }
-             }
-             console.log("After create", window.html_map_resources)
-             const container = document.getElementById("$div_id");
-             if (!container) {
-               console.log("Container not found: exiting...");
-               return;
-             }
-                 
-             const map = new Map({
-               basemap: "$basemap"
-             });
+        (layers_data, layers_js, extent_js) = self._generate_layers_js()
     
-             const layers = [];
-             $layers_js
-    
-             const view = new MapView({
-               map: map, 
-               container: "$div_id",
-               extent: $extent_js,
-               constraints: {
-                 snapToZoom: false,
-                 rotationEnabled: false
-               },
-               navigation: {
-                 actionMap : {
-                   mouseWheel : "none"
-                 }
-               }
-             });
-
-             function destroyMapView() {
-               if (view) {
-                 view.map.destroy()
-                 view.container = null; // Detach the view from the DOM
-                 view.destroy(); // Destroy the view and release resources
-                 console.log("MapView destroyed");
-               }
-             }
-             
-             window.html_map_resources.maps.add({container, destroyMapView})
-    
-        });
-        
-        </script>
-        <div id="$div_id"></div>
-        """)
-    
-        html = map_template.substitute({
+        html = _MAP_TEMPLATE.format_map({
             "sdk_version": self.sdk_version,
             "div_id": self.div_id,
             "basemap": self.basemap,
             "width": self.width,
             "height": self.height,
+            "layers_data": layers_data,
             "layers_js": layers_js,
             "extent_js": extent_js
         })
@@ -230,117 +309,198 @@ class EsriJSMap:
             print(html)
         display(HTML(html))
 
-    # Merges the `merge` extent into `target` in place
+    # Collects the rows from `df` as a list of column value lists. Arrow is used when possible so that the JVM ships
+    # columnar batches instead of pickling each row. Falls back to `collect` when pandas/pyarrow are missing 
+    # (ImportError) or Arrow can't convert a column type (TypeError and NotImplementedError, which Spark's and 
+    # pyarrow's unsupported type errors derive from). Any other failure, e.g. a failed Spark job, is raised as is.
     @staticmethod
-    def _merge_extent(target, merge):
-        target[0] = min(merge[0], target[0])
-        target[1] = min(merge[1], target[1])
-        target[2] = max(merge[2], target[2])
-        target[3] = max(merge[3], target[3])
-    
+    def _collect_columns(df):
+        arrow_conf = "spark.sql.execution.arrow.pyspark.enabled"
+        conf = df.sparkSession.conf
+        arrow_enabled = conf.get(arrow_conf, "false")
+        try:
+            conf.set(arrow_conf, "true")
+            if hasattr(df, "toArrow"):
+                # Spark 4.x
+                table = df.toArrow()
+                return [column.to_pylist() for column in table.columns]
+            else:
+                pdf = df.toPandas()
+                return [pdf[column].tolist() for column in pdf.columns]
+        except (ImportError, TypeError, NotImplementedError):
+            rows = df.collect()
+            return [[row[i] for row in rows] for i in range(len(df.columns))]
+        finally:
+            conf.set(arrow_conf, arrow_enabled)
+
+    # Encodes a list of floats as a base64 string of little-endian Float64 values, which is what a Javascript
+    # Float64Array expects on all mainstream browsers
+    @staticmethod
+    def _encode_doubles(values):
+        buffer = array("d", values)
+        if sys.byteorder == "big":
+            buffer.byteswap()
+        return b64encode(buffer.tobytes()).decode("ascii")
+
     def _make_feature_layer_js(self, df, map_sr, fields, max_records = 100000):
         
         geometry_field = df.st.get_geometry_field()
     
         if geometry_field is None:
             raise ValueError("Unable to determine geometry field")
+
+        # Resolve the schema once up front. Transforming the geometry doesn't change any of the column types.
+        field_types = {field.name: field.dataType for field in df.schema}
     
-        # Transform features to match map spatial reference
-        df = df.withColumn(geometry_field, ST.transform(geometry_field, map_sr))
-        
         sr = df.st.get_spatial_reference()
         if sr is None:
             raise ValueError("Spatial reference is required")
+
+        # Transform features to match map spatial reference
+        if sr.srid != map_sr:
+            df = df.withColumn(geometry_field, ST.transform(geometry_field, map_sr))
+            sr = df.st.get_spatial_reference()
     
-        selected_attributes = df.select(fields).columns
+        # Resolve the fields against the cached schema rather than analyzing a select. Like Spark, names are matched
+        # case-insensitively unless spark.sql.caseSensitive is enabled.
+        case_sensitive = df.sparkSession.conf.get("spark.sql.caseSensitive", "false").lower() == "true"
+        normalize = (lambda name: name) if case_sensitive else str.lower
+        schema_names = {}
+        for name in field_types:
+            schema_names.setdefault(normalize(name), []).append(name)
+        missing_fields = [field for field in fields if normalize(field) not in schema_names]
+        if missing_fields:
+            raise ValueError(f"Unable to find fields: {missing_fields}")
+        ambiguous_fields = {field: schema_names[normalize(field)] for field in fields if len(schema_names[normalize(field)]) > 1}
+        if ambiguous_fields:
+            raise ValueError(f"Ambiguous fields (matching more than one column): {ambiguous_fields}")
+        selected_attributes = list(dict.fromkeys(schema_names[normalize(field)][0] for field in fields))
     
         # Separate geometry from regular attributes
         if geometry_field in selected_attributes:
             selected_attributes.remove(geometry_field)
         
-        sr_json = dumps({ "wkid": sr.srid } if sr.srid != 0 else { "wkt": sr.wkt })
+        sr_json = _dumps_layer({ "wkid": sr.srid } if sr.srid != 0 else { "wkt": sr.wkt })
     
-        geometry_datatype = df.select(geometry_field).schema[0].dataType
-        geometry_ctor = geometry_ctor = self._geometry_mapping.get(type(geometry_datatype), None)
-        geometry_type = geometry_ctor.lower()
-        
-        # This is a clunky way to drop the spatial reference from the geometry so that it doesn't get added
-        # to the produced JSON for each feature. 
-        df = df.withColumn(geometry_field, ST.geom_from_binary(ST.as_binary(geometry_field)))
+        geometry_datatype = field_types[geometry_field]
+        geometry_type = self._geometry_mapping.get(type(geometry_datatype), None).lower()
 
-        # Add OID
-        oid_field = "__oid__"
-        df = df.withColumn(oid_field, F.monotonically_increasing_id() + 1)
-        selected_attributes.append(oid_field)
-    
-        # Collect rows as JSON
-        rows = df.select(
-            ST.as_esri_json(geometry_field).alias("geometry_json"),  # geometry
-            F.to_json(F.struct(*selected_attributes)).alias("attribute_json"), # attributes
-            ST.min_x(geometry_field), ST.min_y(geometry_field), ST.max_x(geometry_field), ST.max_y(geometry_field) # extent
-        ).take(max_records)
+        # Empty layers are kept as "null" features so that nothing is collected or drawn for them
+        empty_layer = ("null", [math.nan, math.nan, math.nan, math.nan])
+        if max_records <= 0:
+            return empty_layer
+        
+        # Features without geometry can't be drawn
+        df = df.where(F.col(geometry_field).isNotNull())
+
+        # Build the per-feature columns before limiting so that the geometry work runs across the source partitions
+        # rather than in the single partition produced by the global limit
+        attributes = F.struct(*selected_attributes).alias("attributes")
+        if geometry_type == "point":
+            # Point coordinates are collected as separate x, y (and z) columns (the GeoArrow "separated" coordinate
+            # layout) and sent to the browser as Float64 buffers instead of as Esri JSON for each feature. M values
+            # are not sent since they aren't used for display.
+            feature_columns = [
+                F.to_json(F.struct(attributes)).alias("feature_json"),
+                ST.x(geometry_field).alias("x"), ST.y(geometry_field).alias("y"), ST.z(geometry_field).alias("z")
+            ]
+        else:
+            # Collect rows as a single JSON graphic per feature. The geometry type is added to each Esri JSON geometry
+            # so that the Maps SDK can autocast it without needing a constructor per feature.
+            geometry = F.from_json(ST.as_esri_json(geometry_field), self._esri_json_schema[geometry_type])\
+                .withField("type", F.lit(geometry_type))
+            feature_columns = [F.to_json(F.struct(attributes, geometry.alias("geometry"))).alias("feature_json")]
+
+        # Both the extent and the features are computed from the same bounded set of rows, so cache them to avoid
+        # reading and transforming the source twice. Only the columns that are aggregated or collected are cached.
+        df = df.select(
+            *feature_columns,
+            ST.min_x(geometry_field).alias("xmin"), ST.min_y(geometry_field).alias("ymin"),
+            ST.max_x(geometry_field).alias("xmax"), ST.max_y(geometry_field).alias("ymax")
+        ).limit(max_records).persist(StorageLevel.MEMORY_AND_DISK)
+        try:
+            # Compute the extent of the collected features in Spark. For points, also count the z values so that z is
+            # only sent when the points have it.
+            aggregates = [F.min("xmin"), F.min("ymin"), F.max("xmax"), F.max("ymax")]
+            if geometry_type == "point":
+                aggregates.append(F.count("z"))
+            result = df.agg(*aggregates).first()
+            if result[0] is None:
+                # There are no features with geometry, so skip collecting them
+                return empty_layer
+            extent = list(result[0:4]) # xmin, ymin, xmax, ymax
+
+            if geometry_type == "point":
+                dimensions = ["x", "y", "z"] if result[4] > 0 else ["x", "y"]
+                (features, *values) = self._collect_columns(df.select(
+                    "feature_json",
+                    *[F.coalesce(dimension, F.lit(math.nan)).alias(dimension) for dimension in dimensions]
+                ))
+                coordinates = {dimension: self._encode_doubles(v) for (dimension, v) in zip(dimensions, values)}
+            else:
+                (features,) = self._collect_columns(df.select("feature_json"))
+                coordinates = None
+        finally:
+            df.unpersist()
     
         # Define fields
-        fields_json = []
-        for field in df.select(selected_attributes).schema:
-            type_name = self._type_mapping.get(field.dataType.typeName(), None)
-            fields_json.append(dumps({"name": field.name, "type": type_name}))
-    
-        # Create feature graphics
-        feature_template = """{geometry: new """ + geometry_ctor + """(%s), attributes: %s}"""
-        extent = [math.nan, math.nan, math.nan, math.nan] # xmin, ymin, xmax, ymax
-        features = []
-        for row in rows:
-            features.append(feature_template % (row[0], row[1]))
-            self._merge_extent(extent, row[2:6])
+        layer_fields = []
+        for field in selected_attributes:
+            type_name = self._type_mapping.get(field_types[field].typeName(), None)
+            layer_fields.append({"name": field, "type": type_name})
+
+        # Add OID. The OID only needs to be unique within the layer so it is assigned in the browser when the layer is
+        # decoded rather than in Spark. This lets the collected feature JSON be joined without touching each feature.
+        oid_field = "__oid__"
+        layer_fields.append({"name": oid_field, "type": "oid"})
+        features_json = "[" + ",".join(features) + "]"
             
-        json = """new FeatureLayer({source: [%s], fields: [%s], "geometryType" : "%s", spatialReference: %s, objectIdField:"%s"}) """ % (",".join(features), ",".join(fields_json), geometry_type, sr_json, oid_field)
+        # FeatureLayer properties as a JSON document
+        json = """{"source": %s, "fields": %s, "geometryType": "%s", "spatialReference": %s, "objectIdField": "%s", "coordinates": %s}""" % (features_json, _dumps_layer(layer_fields), geometry_type, sr_json, oid_field, _dumps_layer(coordinates))
         return (json, extent)
 
     
     def _generate_layers_js(self):
         """
-        Generate JavaScript code for adding layers to the map.
+        Generate JavaScript code for adding layers to the map along with the HTML data blocks holding the layer JSON.
         """
+        layers_data = []
         layers_js = []
-        extent = [math.nan, math.nan, math.nan, math.nan]
         for i, layer in enumerate(self.layers):
-
-            json_string = layer['features']
-            
-            layer_js = f"""
-
-            const layer{i} = {json_string};
-
-            const renderer{i} = {layer['renderer']}
-            if (renderer{i} != null) {{
-              layer{i}.renderer = renderer{i}
-            }}
-
-            const labelingInfo{i} = {layer['labelingInfo']}
-            if (labelingInfo{i} != null) {{
-              layer{i}.labelingInfo = labelingInfo{i}
-            }}
-
-            const popupTemplate{i} = {layer['popupTemplate']}
-            if (popupTemplate{i} != null) {{
-              layer{i}.popupTemplate = popupTemplate{i}
-            }}
-
-            map.add(layer{i});
-            layers.push(layer{i});
-            """
-            layers_js.append(layer_js)
-
-            self._merge_extent(extent, layer["extent"])
-
-        # Pad extent by 20%
-        pad_width = (extent[2] - extent[0]) * .1
-        pad_height = (extent[3] - extent[1]) * .1
+            if layer["features"] == "null":
+                continue
+
+            # The layer JSON is kept out of the script source and parsed with JSON.parse. "<" can only appear within
+            # JSON strings so it is escaped to make sure the data can't close the script element.
+            values = layer | {
+                "i": i, 
+                "data_id": f"{self.div_id}_layer{i}", 
+                "features": layer["features"].replace("<", "\\u003c")
+            }
+            layers_data.append(_LAYER_DATA_TEMPLATE.format_map(values))
+            layers_js.append(_LAYER_TEMPLATE.format_map(values))
+
+        # Merge the layer extents. NaN values (empty layers) fail every comparison and so are ignored.
+        xmin = ymin = math.inf
+        xmax = ymax = -math.inf
+        for layer in self.layers:
+            (lxmin, lymin, lxmax, lymax) = layer["extent"]
+            if lxmin < xmin: xmin = lxmin
+            if lymin < ymin: ymin = lymin
+            if lxmax > xmax: xmax = lxmax
+            if lymax > ymax: ymax = lymax
+
+        if not math.isfinite(xmin):
+            # No features in any layer. Leave the extent unset so the view uses its default.
+            extent_js = "null"
+        else:
+            # Pad extent by 20%
+            pad_width = (xmax - xmin) * .1
+            pad_height = (ymax - ymin) * .1
         
-        extent_js = dumps({"type": "extent", "xmin": extent[0] - pad_width, "ymin": extent[1] - pad_height, "xmax": extent[2] + pad_width, "ymax": extent[3] + pad_height})
+            extent_js = _dumps({"type": "extent", "xmin": xmin - pad_width, "ymin": ymin - pad_height, "xmax": xmax + pad_width, "ymax": ymax + pad_height})
 
-        return ("\n".join(layers_js), extent_js)
+        return ("\n".join(layers_data), "\n".join(layers_js), extent_js)
 
 class Labels:
 
@@ -418,16 +578,12 @@ class Popups:
         return template_json
 
     def fields(*fields):
-        html = ""
-        for field in fields:
-            html += f"<b>{field}:</b> {{{field}}}<br/>"
+        html = "".join(f"<b>{field}:</b> {{{field}}}<br/>" for field in fields)
 
         return {"title": "Fields", "content": html, "_references": fields}
 
     def fields_table(*fields):
-        field_infos = []
-        for field in fields:
-            field_infos.append(dict(fieldName=field, label=field))
+        field_infos = [dict(fieldName=field, label=field) for field in fields]
 
         content = [{
             "type" : "fields",